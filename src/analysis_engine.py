@@ -1,14 +1,24 @@
 # src/analysis_engine.py
+import logging
 from .strategy_configs import STRATEGY_CONFIGS
 from .indicators.moving_average import calculate_moving_average
 from .indicators.rsi import calculate_rsi
-import pandas as pd # For NaN checking, though not explicitly used if indicators handle None
+import numpy as np
+import pandas as pd # For DataFrame input and NaN checking
+
+logger = logging.getLogger(__name__)
+
+def _latest_value(values: np.ndarray):
+    # Last element of an indicator/price array as a Python float, or None if missing (NaN).
+    return None if len(values) == 0 or np.isnan(values[-1]) else float(values[-1])
 
 class AnalysisEngine:
     def __init__(self):
-        print("AnalysisEngine initialized (for dynamic time horizons).")
+        logger.debug("AnalysisEngine initialized (for dynamic time horizons).")
 
-    def generate_signals(self, stock_data: list, timeframe: str): # Renamed time_horizon to timeframe
+    def generate_signals(self, stock_data, timeframe: str): # Renamed time_horizon to timeframe
+        # stock_data: DataFrame with a 'close' column (as returned by fetch_stock_data),
+        # or a list of dicts each with a 'close' key.
         # Default return structure for errors, including time_horizon_applied
         time_horizon_capitalized = timeframe.capitalize() if isinstance(timeframe, str) else "Unknown" # Use timeframe
         
@@ -21,33 +31,48 @@ class AnalysisEngine:
             'config_used': {}
         }
 
-        if not stock_data:
+        if stock_data is None or len(stock_data) == 0:
             error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
             error_return_template['explanation'] = 'No stock data provided or it was empty.'
             return error_return_template
 
         try:
-            # Ensure all items are dicts with 'close' key and 'close' is numeric or None
             valid_prices = []
-            for item in stock_data:
-                if not isinstance(item, dict) or 'close' not in item:
+            if isinstance(stock_data, pd.DataFrame):
+                # Column-wise path: validate the dtype once instead of every row
+                if 'close' not in stock_data.columns:
                     error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
-                    error_return_template['explanation'] = "Stock_data items must be dictionaries with a 'close' key."
+                    error_return_template['explanation'] = "Stock_data DataFrame must have a 'close' column."
                     return error_return_template
-                price = item['close']
-                if not (isinstance(price, (int, float)) or price is None):
+                close_series = stock_data['close']
+                if not pd.api.types.is_numeric_dtype(close_series):
                     error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
                     error_return_template['explanation'] = "Close prices must be numeric (int/float) or None."
                     return error_return_template
-                valid_prices.append(price)
-            
-            close_prices = valid_prices
-            if not close_prices or len(close_prices) < 2: # Need at least 2 for diff in RSI and some MAs
+                close_prices = close_series.to_numpy(dtype=float)
+            else:
+                # Ensure all items are dicts with 'close' key and 'close' is numeric or None
+                for item in stock_data:
+                    if not isinstance(item, dict) or 'close' not in item:
+                        error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
+                        error_return_template['explanation'] = "Stock_data items must be dictionaries with a 'close' key."
+                        return error_return_template
+                    price = item['close']
+                    if not (isinstance(price, (int, float)) or price is None):
+                        error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
+                        error_return_template['explanation'] = "Close prices must be numeric (int/float) or None."
+                        return error_return_template
+                    valid_prices.append(price)
+                close_prices = np.array(valid_prices, dtype=float) # None becomes NaN
+
+            # close_prices is one float64 array shared by all indicator calls below; the indicators
+            # return arrays too, so only the latest value of each is converted back to Python.
+            if len(close_prices) < 2: # Need at least 2 for diff in RSI and some MAs
                 error_return_template['outlook'] = 'DATA_FORMAT_ERROR'
                 error_return_template['explanation'] = 'Not enough valid close price data (minimum 2 required).'
                 return error_return_template
             
-            latest_close_price = close_prices[-1]
+            latest_close_price = _latest_value(close_prices)
             if latest_close_price is None:
                 error_return_template['outlook'] = 'INSUFFICIENT_DATA'
                 error_return_template['explanation'] = 'Latest closing price is None.'
@@ -80,16 +105,14 @@ class AnalysisEngine:
             return error_return_template
             
         for window in ma_windows:
-            ma_series = calculate_moving_average(close_prices, window)
-            latest_ma = ma_series[-1] if ma_series and len(ma_series) == len(close_prices) else None
-            calculated_indicator_values[f'MA_{window}'] = latest_ma
+            ma_series = calculate_moving_average(close_prices, window, output='array')
+            calculated_indicator_values[f'MA_{window}'] = _latest_value(ma_series)
         
         # Calculate RSI
         rsi_period = config.get('rsi', {}).get('period')
         if rsi_period:
-            rsi_series = calculate_rsi(close_prices, rsi_period)
-            latest_rsi = rsi_series[-1] if rsi_series and len(rsi_series) == len(close_prices) else None
-            calculated_indicator_values[f'RSI_{rsi_period}'] = latest_rsi
+            rsi_series = calculate_rsi(close_prices, rsi_period, output='array')
+            calculated_indicator_values[f'RSI_{rsi_period}'] = _latest_value(rsi_series)
         else:
             error_return_template['outlook'] = 'CONFIG_ERROR'
             error_return_template['explanation'] = f"RSI period not defined for {timeframe} in strategy_configs." # Use timeframe
@@ -0,0 +1,114 @@
+# src/cache.py
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = '.cache'
+SECONDS_PER_DAY = 24 * 60 * 60
+MEMORY_CACHE_SIZE = 128
+
+logger = logging.getLogger(__name__)
+
+class FileCache:
+    """
+    Small on-disk cache for akshare responses.
+    Each entry is stored as <cache_dir>/<func_name>/<symbol>_<md5(params)>.pkl next to a JSON
+    sidecar (.json) holding the fetch timestamp, so freshness can be checked without unpickling.
+    The most recently used entries are also kept in memory, so repeat hits within a process skip
+    the unpickling. An in-memory copy is only used while both files are unchanged on disk, and it
+    is shared between callers: treat returned values as read-only.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, memory_size: int = MEMORY_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self._memory = OrderedDict() # data_path -> (file signature, fetched_at, value)
+        self._memory_lock = threading.Lock()
+
+    def _paths(self, func_name: str, symbol: str, params: dict):
+        params_digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, func_name, f"{symbol}_{params_digest}")
+        return base + '.pkl', base + '.json'
+
+    def get(self, func_name: str, symbol: str, params: dict, ttl_days: float = None):
+        """
+        Returns the cached value, or None on a miss.
+        :param ttl_days: Maximum age in days. None means the entry never expires.
+        """
+        data_path, meta_path = self._paths(func_name, symbol, params)
+        try:
+            signature = self._signature(data_path, meta_path)
+            with self._memory_lock:
+                entry = self._memory.get(data_path)
+                if entry is not None:
+                    self._memory.move_to_end(data_path)
+            if entry is not None and entry[0] == signature:
+                _, fetched_at, value = entry
+                return None if self._is_expired(fetched_at, ttl_days) else value
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                fetched_at = json.load(f)['fetched_at']
+            if self._is_expired(fetched_at, ttl_days):
+                return None
+            with open(data_path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+            # Missing, partially written or unreadable entries are treated as misses.
+            return None
+        self._remember(data_path, signature, fetched_at, value)
+        return value
+
+    def set(self, func_name: str, symbol: str, params: dict, value) -> None:
+        data_path, meta_path = self._paths(func_name, symbol, params)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        # Write to temporary files and rename so concurrent readers never see half an entry.
+        # The data file goes first: a sidecar is only ever published for a complete payload.
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(data_path + tmp_suffix, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(data_path + tmp_suffix, data_path)
+        fetched_at = time.time()
+        with open(meta_path + tmp_suffix, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': fetched_at, 'params': params}, f, default=str)
+        os.replace(meta_path + tmp_suffix, meta_path)
+        self._remember(data_path, self._signature(data_path, meta_path), fetched_at, value)
+
+    @staticmethod
+    def _signature(data_path: str, meta_path: str) -> tuple:
+        # Changes whenever either file is rewritten (by this or another process), which
+        # invalidates the in-memory copy. set() replaces files by rename, so the inode changes too.
+        data_stat, meta_stat = os.stat(data_path), os.stat(meta_path)
+        return tuple((st.st_ino, st.st_mtime_ns, st.st_size) for st in (data_stat, meta_stat))
+
+    @staticmethod
+    def _is_expired(fetched_at: float, ttl_days: float) -> bool:
+        return ttl_days is not None and time.time() - fetched_at > ttl_days * SECONDS_PER_DAY
+
+    def _remember(self, data_path: str, signature: tuple, fetched_at: float, value) -> None:
+        if self.memory_size <= 0:
+            return
+        with self._memory_lock:
+            self._memory[data_path] = (signature, fetched_at, value)
+            self._memory.move_to_end(data_path)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get_or_set(self, func_name: str, symbol: str, params: dict, loader, ttl_days: float = None):
+        """
+        Returns the cached value if it is still fresh, otherwise calls loader() and caches its result.
+        None results are not cached. Errors raised by loader propagate to the caller.
+        """
+        value = self.get(func_name, symbol, params, ttl_days=ttl_days)
+        if value is not None:
+            return value
+        value = loader()
+        if value is not None:
+            try:
+                self.set(func_name, symbol, params, value)
+            except OSError as e:
+                # A read-only or full disk should not break the fetch itself.
+                logger.warning("Could not write cache entry for %s/%s: %s", func_name, symbol, e)
+        return value
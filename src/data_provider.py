@@ -1,78 +1,235 @@
-import akshare
+import functools
+import logging
+import math
+import re
+import threading
+import time
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
-def fetch_stock_data(stock_code: str, data_type: str = 'daily', start_date: str = None, end_date: str = None):
+try:
+    from .cache import FileCache, SECONDS_PER_DAY
+    from .http_session import install_shared_session
+except ImportError:
+    from cache import FileCache, SECONDS_PER_DAY
+    from http_session import install_shared_session
+
+# Status messages go through logging so bulk fetches stay quiet unless the caller opts in
+# (e.g. logging.basicConfig(level=logging.INFO)); warnings and errors still reach stderr.
+logger = logging.getLogger(__name__)
+
+# akshare endpoint modules used below that call requests.get directly; route them through one
+# keep-alive session so repeated fetches to Eastmoney skip the TCP+TLS handshake.
+_AKSHARE_HTTP_MODULES = (
+    'akshare.stock_feature.stock_hist_em',
+    'akshare.stock.stock_info_em',
+)
+
+_akshare = None
+_akshare_lock = threading.Lock()
+
+def _get_akshare():
+    # akshare takes seconds to import, so it is loaded on first fetch rather than at module import.
+    # Runs that are served entirely from the cache (or never fetch) skip it altogether.
+    global _akshare
+    if _akshare is None:
+        with _akshare_lock:
+            if _akshare is None:
+                import akshare
+                install_shared_session(_AKSHARE_HTTP_MODULES)
+                _akshare = akshare
+    return _akshare
+
+# On-disk cache for raw akshare responses, so repeated runs do not pay the HTTP round-trip again.
+_cache = FileCache()
+PRICE_CACHE_TTL_DAYS = 1
+BASIC_INFO_CACHE_TTL_DAYS = 30
+
+# A-share codes are six digits (Shanghai 6xxxxx, Shenzhen 0xxxxx/3xxxxx, Beijing 4xxxxx/8xxxxx/920xxx).
+# Anything else is rejected up front instead of waiting for akshare to fail over the network.
+_STOCK_CODE_RE = re.compile(r'[0-9]{6}')
+
+def _is_valid_stock_code(stock_code) -> bool:
+    return isinstance(stock_code, str) and _STOCK_CODE_RE.fullmatch(stock_code) is not None
+
+def _none_if_empty(df):
+    # Empty responses are not cached: they are often transient upstream hiccups.
+    return None if df is None or df.empty else df
+
+SPOT_CACHE_TTL_DAYS = 1
+MAX_FETCH_WORKERS = 16
+# Upper bound on akshare requests in flight across all threads, so batch fetches do not trip
+# Eastmoney's rate limiting. Cache hits do not take a slot.
+MAX_CONCURRENT_REQUESTS = 8
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+def _call_akshare(func_name: str, **kwargs):
+    with _request_slots:
+        return getattr(_get_akshare(), func_name)(**kwargs)
+
+# Columns of the DataFrame returned by fetch_stock_data (and keys of each record).
+STOCK_DATA_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Chinese to English names for akshare.stock_zh_a_hist columns.
+_HIST_COLUMN_MAPPING = {
+    '日期': 'date',
+    '股票代码': 'code',
+    '开盘': 'open',
+    '收盘': 'close',
+    '最高': 'high',
+    '最低': 'low',
+    '成交量': 'volume',
+    '成交额': 'turnover',
+    '振幅': 'amplitude',
+    '涨跌幅': 'change_pct',
+    '涨跌额': 'change_amt',
+    '换手率': 'turnover_rate',
+}
+# The akshare columns behind STOCK_DATA_COLUMNS, in that order. Responses are projected onto these
+# right after the fetch, so the unused ones (turnover, amplitude, ...) are never stored or processed.
+_HIST_CN_COLUMNS = tuple(cn for en in STOCK_DATA_COLUMNS for cn, mapped in _HIST_COLUMN_MAPPING.items() if mapped == en)
+_HIST_EN_COLUMNS = list(STOCK_DATA_COLUMNS)
+
+# Per-symbol price history store, appended to incrementally (see _load_stock_hist_raw).
+# The stored column set is part of the key, so changing _HIST_CN_COLUMNS starts a fresh store.
+PRICE_HISTORY_NAMESPACE = 'stock_zh_a_hist'
+_PRICE_HISTORY_PARAMS = {'period': 'daily', 'adjust': 'qfq', 'columns': list(_HIST_CN_COLUMNS)}
+
+def _fetch_stock_hist_raw(stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+    # akshare.stock_zh_a_hist requires start_date and end_date in 'YYYYMMDD' format.
+    # 'qfq' means forward-adjusted prices (前复权)
+    # 'hfq' means backward-adjusted prices (后复权)
+    raw_df = _call_akshare('stock_zh_a_hist',
+                           symbol=stock_code,
+                           period="daily",
+                           start_date=start_date,
+                           end_date=end_date,
+                           adjust="qfq")
+    # Keep whichever of the needed columns are present; missing ones are reported downstream.
+    return raw_df[[col for col in _HIST_CN_COLUMNS if col in raw_df.columns]]
+
+@functools.lru_cache(maxsize=1)
+def _default_date_window(today: date) -> tuple:
+    # ('YYYYMMDD' one year ago, 'YYYYMMDD' today). Keyed by the calendar day, so batch fetches
+    # format the strings once per day instead of on every call.
+    return (today - timedelta(days=365)).strftime('%Y%m%d'), today.strftime('%Y%m%d')
+
+def _bar_dates(raw_df: pd.DataFrame) -> np.ndarray:
+    # akshare '日期' values as a datetime64 array. Bars come in date order, so positions of
+    # 'YYYYMMDD' dates can be found with searchsorted (see _date_position) instead of a full scan.
+    return pd.to_datetime(raw_df['日期']).to_numpy()
+
+def _date_position(bar_dates: np.ndarray, date_str: str, side: str = 'left') -> int:
+    return int(bar_dates.searchsorted(np.datetime64(pd.Timestamp(date_str)), side=side))
+
+def _load_stock_hist_raw(stock_code: str, start_date: str, end_date: str):
     """
-    Fetches historical stock data using akshare.
-    :param stock_code: Stock code (e.g., "000001", "600519"). Akshare usually handles prefixing.
-    :param data_type: Type of data, defaults to 'daily'. Currently only 'daily' is implemented for actual fetching.
-    :param start_date: Start date in 'YYYYMMDD' format for akshare. If None, defaults to about 1 year ago.
-    :param end_date: End date in 'YYYYMMDD' format for akshare. If None, defaults to today.
-    :return: List of dictionaries with stock data, or empty list if error.
+    Returns the raw akshare history for [start_date, end_date], or None if there is none.
+    Bars are kept in a per-symbol store in the on-disk cache ({'start', 'end', 'fetched_at', 'df'},
+    where start/end is the date range already covered), so only bars missing from it are downloaded.
     """
-    print(f"Fetching {data_type} data for {stock_code} using akshare...")
+    today = _default_date_window(date.today())[1]
+    store = _cache.get(PRICE_HISTORY_NAMESPACE, stock_code, _PRICE_HISTORY_PARAMS)
 
-    if data_type != 'daily':
-        print(f"Data type '{data_type}' not yet supported for real data fetching. Returning mock data concept.")
-        # Fallback to mock or empty if other types were expected to be handled elsewhere
-        return [
-            {'date': '2023-01-01', 'open': 10.0, 'high': 10.5, 'low': 9.8, 'close': 10.2, 'volume': 10000},
-        ]
+    if store is None or start_date < store['start']:
+        # Nothing usable stored: fetch the whole window (keeping any later coverage we had).
+        fetch_start, fetch_end = start_date, end_date if store is None else max(end_date, store['end'])
+        store = None
+    else:
+        # A bar fetched on day D may be a partial mid-session one if it is D's own bar, so only
+        # windows ending before the day of the fetch are final; others are refreshed after
+        # PRICE_CACHE_TTL_DAYS.
+        fetched_day = datetime.fromtimestamp(store['fetched_at']).strftime('%Y%m%d')
+        is_fresh = end_date < fetched_day or time.time() - store['fetched_at'] < PRICE_CACHE_TTL_DAYS * SECONDS_PER_DAY
+        if end_date <= store['end'] and is_fresh:
+            fetch_start = None
+        else:
+            # Re-fetch from the second-to-last stored bar: the last one may be partial, and the one
+            # before it is final, so comparing it tells whether qfq prices were re-adjusted since.
+            stored_dates = _bar_dates(store['df'])
+            fetch_start = pd.Timestamp(stored_dates[-2]).strftime('%Y%m%d') if len(stored_dates) >= 2 else store['start']
+            fetch_end = max(end_date, store['end'])
 
-    # Set default date range to last 1 year if not specified
-    if end_date is None:
-        end_date = datetime.now().strftime('%Y%m%d')
-    if start_date is None:
-        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
-    
+    if fetch_start is not None:
+        new_df = _fetch_stock_hist_raw(stock_code, fetch_start, fetch_end)
+        if store is not None and new_df.empty:
+            # The range starts at a stored bar, so an empty answer is an upstream hiccup: keep the
+            # store as is and serve what it has.
+            fetch_start = None
+        elif store is not None:
+            stored_df = store['df']
+            stored_dates, first_new_date = _bar_dates(stored_df), _bar_dates(new_df.iloc[:1])[0]
+            overlap = int(stored_dates.searchsorted(first_new_date))
+            if (overlap < len(stored_dates) and stored_dates[overlap] == first_new_date
+                    and not math.isclose(stored_df['收盘'].iat[overlap], new_df['收盘'].iat[0])):
+                # A dividend/split re-adjusted the history: stored bars are stale, refetch it all.
+                # If that comes back empty, it is a hiccup as above: serve the stored bars for now.
+                refetched_df = _fetch_stock_hist_raw(stock_code, store['start'], fetch_end)
+                if refetched_df.empty:
+                    fetch_start = None
+                else:
+                    fetch_start, new_df, store = store['start'], refetched_df, None
+    if fetch_start is not None:
+        if store is None:
+            if new_df.empty:
+                return None
+            merged_df, covered_start = new_df, fetch_start
+        else:
+            stored_df = store['df']
+            kept_df = stored_df.iloc[:_date_position(_bar_dates(stored_df), fetch_start)]
+            merged_df = pd.concat([kept_df, new_df], ignore_index=True)
+            covered_start = store['start']
+        store = {'start': covered_start, 'end': min(fetch_end, today), 'fetched_at': time.time(), 'df': merged_df}
+        try:
+            _cache.set(PRICE_HISTORY_NAMESPACE, stock_code, _PRICE_HISTORY_PARAMS, store)
+        except OSError as e:
+            logger.warning("Could not write price history cache for %s: %s", stock_code, e)
+
+    # Cut the requested window out of the store by position before any per-row processing, so
+    # the rename/date/NaN passes downstream only touch the bars that are returned.
+    stored_df = store['df']
+    stored_dates = _bar_dates(stored_df)
+    window_df = stored_df.iloc[_date_position(stored_dates, start_date):_date_position(stored_dates, end_date, 'right')]
+    return window_df.reset_index(drop=True) if not window_df.empty else None
+
+def _fetch_stock_hist_df(stock_code: str, start_date: str, end_date: str):
+    """
+    Fetches daily history from akshare and normalizes it to the English column layout.
+    :return: DataFrame with the relevant columns, or None if nothing usable was returned.
+    """
     try:
-        # akshare.stock_zh_a_hist requires start_date and end_date in 'YYYYMMDD' format.
-        # 'qfq' means forward-adjusted prices (前复权)
-        # 'hfq' means backward-adjusted prices (后复权)
-        stock_hist_df = akshare.stock_zh_a_hist(symbol=stock_code, 
-                                                period="daily", 
-                                                start_date=start_date, 
-                                                end_date=end_date, 
-                                                adjust="qfq")
-
-        if stock_hist_df.empty:
-            print(f"No data returned for {stock_code} for the period {start_date}-{end_date}. It might be an invalid code, no data available for the period, or an issue with akshare.")
-            return []
-
-        # Rename columns from Chinese to English
-        column_mapping = {
-            '日期': 'date',
-            '开盘': 'open',
-            '最高': 'high',
-            '最低': 'low',
-            '收盘': 'close',
-            '成交量': 'volume',
-            # Add other potential mappings if needed:
-            # '成交额': 'turnover',
-            # '振幅': 'amplitude',
-            # '涨跌幅': 'change_pct',
-            # '涨跌额': 'change_amt',
-            # '换手率': 'turnover_rate'
-        }
-        stock_hist_df.rename(columns=column_mapping, inplace=True)
+        stock_hist_df = _load_stock_hist_raw(stock_code, start_date, end_date)
+
+        if stock_hist_df is None:
+            logger.warning("No data returned for %s for the period %s-%s. It might be an invalid code, no data available for the period, or an issue with akshare.", stock_code, start_date, end_date)
+            return None
+
+        # Rename columns from Chinese to English.
+        # Fast path: assign the English header positionally when all projected columns are present;
+        # fall back to a by-name rename if akshare's schema has drifted.
+        if tuple(stock_hist_df.columns) == _HIST_CN_COLUMNS:
+            stock_hist_df.columns = _HIST_EN_COLUMNS
+        else:
+            stock_hist_df = stock_hist_df.rename(columns=_HIST_COLUMN_MAPPING)
 
         # Ensure 'date' is string in YYYY-MM-DD format
-        # akshare '日期' is typically already in 'YYYY-MM-DD' string format or datetime object
-        if not stock_hist_df.empty and isinstance(stock_hist_df['date'].iloc[0], pd.Timestamp):
-            stock_hist_df['date'] = stock_hist_df['date'].dt.strftime('%Y-%m-%d')
-        elif not stock_hist_df.empty: # If it's already a string, ensure format (e.g. from other sources)
-             stock_hist_df['date'] = pd.to_datetime(stock_hist_df['date']).dt.strftime('%Y-%m-%d')
+        # akshare '日期' may hold 'YYYY-MM-DD' strings, datetime.date or Timestamps; one vectorized pass
+        # handles all of them. The explicit format skips per-value inference; unparseable dates become
+        # NaT and the row is dropped below.
+        parsed_dates = pd.to_datetime(stock_hist_df['date'], format='%Y-%m-%d', cache=True, errors='coerce')
+        stock_hist_df['date'] = parsed_dates.dt.strftime('%Y-%m-%d')
 
 
-        # Select relevant columns and convert to list of dicts
-        # Ensure all necessary columns exist after renaming, otherwise .to_dict will fail or have missing keys.
-        relevant_columns = ['date', 'open', 'high', 'low', 'close', 'volume']
+        # Select relevant columns
+        # Ensure all necessary columns exist after renaming, otherwise records will have missing keys.
+        relevant_columns = STOCK_DATA_COLUMNS
         
         # Check if all relevant columns are present
         missing_cols = [col for col in relevant_columns if col not in stock_hist_df.columns]
         if missing_cols:
-            print(f"Warning: The following expected columns are missing from akshare output for {stock_code}: {missing_cols}. Returning partial data or empty if essential ones are missing.")
+            logger.warning("The following expected columns are missing from akshare output for %s: %s. Returning partial data or empty if essential ones are missing.", stock_code, missing_cols)
             # Decide if to proceed or return empty. For now, proceed with available ones.
             # relevant_columns = [col for col in relevant_columns if col in stock_hist_df.columns]
 
@@ -82,52 +239,228 @@ def fetch_stock_data(stock_code: str, data_type: str = 'daily', start_date: str
         # For this specific list of columns, ensure they are present before trying to dropna on them.
         final_columns_to_use = [col for col in relevant_columns if col in stock_hist_df.columns]
         if not all(col in stock_hist_df.columns for col in ['date', 'open', 'high', 'low', 'close', 'volume']):
-             print(f"Essential data columns missing for {stock_code}. Cannot process.")
-             return []
+             logger.error("Essential data columns missing for %s. Cannot process.", stock_code)
+             return None
 
-        data_list = stock_hist_df[final_columns_to_use].dropna(subset=['open', 'high', 'low', 'close', 'volume']).to_dict(orient='records')
-        
-        print(f"Successfully fetched and processed {len(data_list)} records for {stock_code} from {start_date} to {end_date}.")
-        return data_list
+        # One numpy NaN reduction over the price block instead of dropna's index-rebuilding path;
+        # rows whose date could not be parsed are dropped too.
+        essential_price_columns = ['open', 'high', 'low', 'close', 'volume']
+        valid_rows = ~np.isnan(stock_hist_df[essential_price_columns].to_numpy(dtype=float)).any(axis=1)
+        valid_rows &= parsed_dates.notna().to_numpy()
+        # Row mask and column projection in one indexing step, so only one new frame is built.
+        return stock_hist_df.loc[valid_rows, final_columns_to_use].reset_index(drop=True)
 
     except Exception as e:
-        print(f"Error fetching or processing data for {stock_code} using akshare: {e}")
+        logger.error("Error fetching or processing data for %s using akshare: %s", stock_code, e)
         # More specific error handling could be added here based on common akshare exceptions
-        return []
+        return None
+
+def _load_stock_data_df(stock_code: str, data_type: str, start_date: str, end_date: str) -> pd.DataFrame:
+    if not _is_valid_stock_code(stock_code):
+        logger.warning("Invalid stock code %r: expected six digits. No data to fetch.", stock_code)
+        return pd.DataFrame(columns=STOCK_DATA_COLUMNS)
+
+    logger.debug("Fetching %s data for %s using akshare...", data_type, stock_code)
 
-def fetch_stock_basic_info(stock_code: str) -> dict:
+    if data_type != 'daily':
+        logger.warning("Data type '%s' not yet supported for real data fetching. Returning mock data concept.", data_type)
+        # Fallback to mock or empty if other types were expected to be handled elsewhere
+        return pd.DataFrame([
+            {'date': '2023-01-01', 'open': 10.0, 'high': 10.5, 'low': 9.8, 'close': 10.2, 'volume': 10000},
+        ])
+
+    # Set default date range to last 1 year if not specified
+    if start_date is None or end_date is None:
+        default_start, default_end = _default_date_window(date.today())
+        start_date = default_start if start_date is None else start_date
+        end_date = default_end if end_date is None else end_date
+
+    # An empty window cannot return any bars; skip the HTTP round-trip entirely.
+    # Both dates are 'YYYYMMDD', so string comparison orders them correctly.
+    if start_date > end_date:
+        logger.warning("Start date %s is after end date %s for %s. No data to fetch.", start_date, end_date, stock_code)
+        return pd.DataFrame(columns=STOCK_DATA_COLUMNS)
+
+    stock_hist_df = _fetch_stock_hist_df(stock_code, start_date, end_date)
+    if stock_hist_df is None:
+        return pd.DataFrame(columns=STOCK_DATA_COLUMNS)
+    return stock_hist_df
+
+def _iter_df_rows(df: pd.DataFrame):
+    # Same rows as df.to_dict(orient='records') (native Python scalars), but converts each column
+    # once with tolist() instead of boxing cell by cell, which is several times faster.
+    columns = list(df.columns)
+    for row in zip(*(df[col].tolist() for col in columns)):
+        yield dict(zip(columns, row))
+
+def _df_to_records(df: pd.DataFrame) -> list:
+    return list(_iter_df_rows(df))
+
+def iter_stock_data(stock_code: str, data_type: str = 'daily', start_date: str = None, end_date: str = None):
+    """
+    Yields historical stock data records one at a time instead of building a full list.
+    Useful for callers that consume records sequentially, since no list of dicts is built
+    (only one flat list per column).
+    Parameters are the same as for fetch_stock_data.
+    :return: Generator of dictionaries with stock data. Yields nothing if an error occurs.
+    """
+    stock_data_df = _load_stock_data_df(stock_code, data_type, start_date, end_date)
+    yield from _iter_df_rows(stock_data_df)
+
+def fetch_stock_data(stock_code: str, data_type: str = 'daily', start_date: str = None, end_date: str = None,
+                     as_records: bool = False):
+    """
+    Fetches historical stock data using akshare.
+    :param stock_code: Stock code (e.g., "000001", "600519"). Akshare usually handles prefixing.
+    :param data_type: Type of data, defaults to 'daily'. Currently only 'daily' is implemented for actual fetching.
+    :param start_date: Start date in 'YYYYMMDD' format for akshare. If None, defaults to about 1 year ago.
+    :param end_date: End date in 'YYYYMMDD' format for akshare. If None, defaults to today.
+    :param as_records: If True, return a list of dictionaries (one per row) instead of a DataFrame.
+    :return: DataFrame with columns STOCK_DATA_COLUMNS (empty if error), or a list of dictionaries
+             (empty list if error) when as_records is True.
+    """
+    stock_data_df = _load_stock_data_df(stock_code, data_type, start_date, end_date)
+    if not stock_data_df.empty:
+        logger.info("Successfully fetched and processed %s records for %s.", len(stock_data_df), stock_code)
+    if as_records:
+        return _df_to_records(stock_data_df)
+    return stock_data_df
+
+@functools.lru_cache(maxsize=1)
+def _load_all_stock_names() -> dict:
+    # Stock code -> name for the whole A-share universe. Shared by every snapshot lookup: read-only.
+    # Raises instead of returning {} on failure so that lru_cache does not pin the failure.
+    spot_df = _cache.get_or_set(
+        'stock_zh_a_spot_em', 'all', {},
+        loader=lambda: _none_if_empty(_call_akshare('stock_zh_a_spot_em')),
+        ttl_days=SPOT_CACHE_TTL_DAYS)
+    if spot_df is None:
+        raise ValueError("akshare.stock_zh_a_spot_em returned no data.")
+    return dict(zip(spot_df['代码'].tolist(), spot_df['名称'].tolist()))
+
+def fetch_all_stock_basic_info() -> dict:
+    '''
+    Fetches basic information (the name) for the whole A-share universe in one snapshot
+    via akshare.stock_zh_a_spot_em, keyed by stock code.
+    The snapshot is loaded once per process (and cached on disk for SPOT_CACHE_TTL_DAYS), and
+    is what fetch_stock_basic_info(..., use_snapshot=True) answers from.
+    Note that akshare pages through the snapshot with a delay between pages, so the first load
+    is slow: only worth it when looking up many codes.
+    :return: New dict of stock code -> info dict (same keys as fetch_stock_basic_info), or empty dict if error.
+    '''
+    logger.info("Fetching basic info for all A-shares using akshare.stock_zh_a_spot_em...")
+    try:
+        all_names = _load_all_stock_names()
+    except Exception as e:
+        logger.error("Error fetching A-share snapshot using akshare.stock_zh_a_spot_em: %s", e)
+        return {}
+    logger.info("Loaded basic info for %s A-shares.", len(all_names))
+    return {code: {'name': name} for code, name in all_names.items()}
+
+def fetch_stock_basic_info(stock_code: str, use_snapshot: bool = False) -> dict:
     '''
     Fetches basic information for a given stock code, primarily its name.
     Uses Eastmoney's API via akshare.
+    :param stock_code: Stock code (e.g., "000001", "600519").
+    :param use_snapshot: If True, answer from the market-wide snapshot (see fetch_all_stock_basic_info)
+                         instead of a single-symbol stock_individual_info_em request. Codes missing
+                         from the snapshot, e.g. newly listed ones, are still looked up individually.
+    :return: Dict with 'name', or an empty dict if the name cannot be found.
     '''
-    print(f"Fetching basic info for {stock_code} using akshare.stock_individual_info_em...")
+    if not _is_valid_stock_code(stock_code):
+        logger.warning("Invalid stock code %r: expected six digits. No basic info to fetch.", stock_code)
+        return {}
+
+    if use_snapshot:
+        try:
+            stock_name = _load_all_stock_names().get(stock_code)
+        except Exception as e:
+            logger.error("Error fetching A-share snapshot using akshare.stock_zh_a_spot_em: %s", e)
+            stock_name = None
+        if stock_name:
+            return {'name': stock_name}
+        logger.debug("No basic info for %s in the A-share snapshot; looking it up individually.", stock_code)
+
+    logger.debug("Fetching basic info for %s using akshare.stock_individual_info_em...", stock_code)
     try:
         # stock_individual_info_em returns a DataFrame with 'item' and 'value' columns
-        stock_info_df = akshare.stock_individual_info_em(symbol=stock_code)
+        stock_info_df = _cache.get_or_set(
+            'stock_individual_info_em', stock_code, {},
+            loader=lambda: _none_if_empty(_call_akshare('stock_individual_info_em', symbol=stock_code)),
+            ttl_days=BASIC_INFO_CACHE_TTL_DAYS)
         
-        if stock_info_df.empty:
-            print(f"No basic info returned for {stock_code} from stock_individual_info_em.")
+        if stock_info_df is None:
+            logger.warning("No basic info returned for %s from stock_individual_info_em.", stock_code)
             return {}
 
-        # Convert the DataFrame to a dictionary for easier lookup
-        # Example: item='股票名称', value='平安银行' becomes info_dict['股票名称'] = '平安银行'
-        info_dict = pd.Series(stock_info_df.value.values, index=stock_info_df.item).to_dict()
-
-        # Key for stock name in stock_individual_info_em is '股票简称'
-        stock_name = info_dict.get('股票简称') 
+        # Key for stock name in stock_individual_info_em is '股票简称'.
+        # Only that one row is needed, so it is found with a boolean mask over the raw item array
+        # instead of building a dict of every (item, value) pair.
+        items = stock_info_df['item'].to_numpy()
+        name_rows = np.flatnonzero(items == '股票简称')
+        stock_name = stock_info_df['value'].to_numpy()[name_rows[0]] if len(name_rows) else None
         
         if stock_name:
-            print(f"Found stock name: {stock_name} for code: {stock_code}")
+            logger.info("Found stock name: %s for code: %s", stock_name, stock_code)
             return {'name': stock_name}
         else:
-            print(f"Could not find stock name key ('股票简称') in info for {stock_code}. Available keys: {list(info_dict.keys())}")
+            logger.warning("Could not find stock name key ('股票简称') in info for %s. Available keys: %s", stock_code, items.tolist())
             return {}
             
     except Exception as e:
-        print(f"Error fetching basic info for {stock_code} using akshare.stock_individual_info_em: {e}")
+        logger.error("Error fetching basic info for %s using akshare.stock_individual_info_em: %s", stock_code, e)
         return {}
 
+def fetch_many(stock_codes: list, fn=fetch_stock_data, **kwargs) -> dict:
+    """
+    Calls a per-symbol fetcher for several stock codes concurrently.
+    akshare calls are I/O-bound HTTP requests, so threads overlap them well despite the GIL;
+    at most MAX_CONCURRENT_REQUESTS of them hit the network at once.
+    :param stock_codes: List of stock codes.
+    :param fn: Fetcher taking the stock code as first argument, e.g. fetch_stock_data or fetch_stock_basic_info.
+    :param kwargs: Passed through to fn.
+    :return: Dict of stock code -> fn result.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        results = executor.map(lambda code: fn(code, **kwargs), stock_codes)
+        return dict(zip(stock_codes, results))
+
+def fetch_stock_data_many(stock_codes: list, **kwargs) -> dict:
+    """
+    Fetches historical data for several stock codes concurrently.
+    :param stock_codes: List of stock codes.
+    :param kwargs: Passed through to fetch_stock_data (data_type, start_date, end_date, as_records).
+    :return: Dict of stock code -> fetch_stock_data result.
+    """
+    return fetch_many(stock_codes, fetch_stock_data, **kwargs)
+
+def fetch_many_stock_data(stock_codes: list, data_type: str = 'daily', start_date: str = None,
+                          end_date: str = None) -> pd.DataFrame:
+    """
+    Fetches historical data for several stock codes concurrently into one long-format DataFrame,
+    so multi-symbol indicator work can use groupby(level='code') instead of a per-symbol loop.
+    :param stock_codes: List of stock codes.
+    :return: DataFrame with columns STOCK_DATA_COLUMNS and a (code, row) MultiIndex. Codes without
+             data contribute no rows; empty if none of them returned data.
+    """
+    results = fetch_many(stock_codes, fetch_stock_data, data_type=data_type, start_date=start_date, end_date=end_date)
+    # Empty frames are left out: their object-dtype columns would upcast the numeric ones on concat.
+    frames = {code: df for code, df in results.items() if not df.empty}
+    if not frames:
+        return pd.DataFrame(columns=STOCK_DATA_COLUMNS)
+    return pd.concat(frames.values(), keys=frames.keys(), names=['code', None])
+
+def fetch_stock_basic_info_many(stock_codes: list, use_snapshot: bool = False) -> dict:
+    """
+    Fetches basic info for several stock codes concurrently.
+    :param stock_codes: List of stock codes.
+    :param use_snapshot: Passed through to fetch_stock_basic_info.
+    :return: Dict of stock code -> fetch_stock_basic_info result.
+    """
+    return fetch_many(stock_codes, fetch_stock_basic_info, use_snapshot=use_snapshot)
+
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
     print("Running data_provider.py example usage...")
     
     # Example: Ping An Bank (000001)
@@ -138,25 +471,27 @@ if __name__ == '__main__':
     start_test_date = one_month_ago.strftime('%Y%m%d')
     end_test_date = today.strftime('%Y%m%d')
 
-    data_pa = fetch_stock_data("000001", start_date=start_test_date, end_date=end_test_date)
-    if data_pa:
-        print(f"Data for 000001 (first 3 records of last month): {data_pa[:3]}")
-        print(f"Data for 000001 (last 3 records of last month): {data_pa[-3:] if len(data_pa) > 2 else data_pa}")
+    # 000001 (Ping An Bank), 600519 (Kweichow Moutai) and an invalid code, fetched concurrently
+    print("\nFetching last month of data for 000001, 600519 and INVALIDCODE concurrently...")
+    data_by_code = fetch_stock_data_many(["000001", "600519", "INVALIDCODE"], start_date=start_test_date, end_date=end_test_date)
+
+    data_pa = data_by_code["000001"]
+    if not data_pa.empty:
+        print(f"Data for 000001 (first 3 records of last month):\n{data_pa.head(3)}")
+        print(f"Data for 000001 (last 3 records of last month):\n{data_pa.tail(3)}")
 
-    print("\nFetching data for Kweichow Moutai (600519)...")
-    data_moutai = fetch_stock_data("600519", start_date=start_test_date, end_date=end_test_date)
-    if data_moutai:
-        print(f"Data for 600519 (first 3 records of last month): {data_moutai[:3]}")
+    data_moutai = data_by_code["600519"]
+    if not data_moutai.empty:
+        print(f"Data for 600519 (first 3 records of last month):\n{data_moutai.head(3)}")
 
     # Invalid code example for fetch_stock_data
-    print("\nFetching data for an invalid code (INVALIDCODE)...")
-    data_invalid = fetch_stock_data("INVALIDCODE", start_date=start_test_date, end_date=end_test_date)
-    if not data_invalid:
+    data_invalid = data_by_code["INVALIDCODE"]
+    if data_invalid.empty:
         print("No data for INVALIDCODE as expected.")
 
-    # Test with default dates (last 1 year) for fetch_stock_data
+    # Test with default dates (last 1 year) for fetch_stock_data, as a list of records
     print("\nFetching data for 000002 (Vanke) with default dates (last 1 year)...")
-    data_vanke_default_dates = fetch_stock_data("000002")
+    data_vanke_default_dates = fetch_stock_data("000002", as_records=True)
     if data_vanke_default_dates:
         print(f"Data for 000002 (first 3 records): {data_vanke_default_dates[:3]}")
         print(f"Total records for 000002 (last 1 year): {len(data_vanke_default_dates)}")
@@ -166,22 +501,18 @@ if __name__ == '__main__':
     # --- Testing fetch_stock_basic_info ---
     print("\n--- Testing fetch_stock_basic_info ---")
 
-    # Test fetch_stock_basic_info with a valid stock code
-    info1 = fetch_stock_basic_info("000001") # Ping An Bank
-    if info1 and info1.get('name'):
-        print(f"Fetched Info for 000001: Name - {info1['name']}")
-    else:
-        print(f"Failed to fetch or find name for 000001. Result: {info1}")
+    # 000001 (Ping An Bank), 600519 (Kweichow Moutai) and an invalid code (999999)
+    info_by_code = fetch_stock_basic_info_many(["000001", "600519", "999999"])
 
-    # Test with another valid stock code
-    info2 = fetch_stock_basic_info("600519") # Kweichow Moutai
-    if info2 and info2.get('name'):
-        print(f"Fetched Info for 600519: Name - {info2['name']}")
-    else:
-        print(f"Failed to fetch or find name for 600519. Result: {info2}")
+    for code in ["000001", "600519"]:
+        info = info_by_code[code]
+        if info and info.get('name'):
+            print(f"Fetched Info for {code}: Name - {info['name']}")
+        else:
+            print(f"Failed to fetch or find name for {code}. Result: {info}")
         
     # Test with an invalid stock code
-    info_invalid_basic = fetch_stock_basic_info("999999") # Invalid code
+    info_invalid_basic = info_by_code["999999"]
     if not info_invalid_basic or not info_invalid_basic.get('name'): # Expect empty dict or dict without 'name'
         print(f"Correctly handled invalid code 999999 for basic info. Result: {info_invalid_basic}")
     else:
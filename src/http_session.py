@@ -0,0 +1,57 @@
+# src/http_session.py
+import importlib
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 32
+# Transient connection errors and 429/5xx answers from Eastmoney are retried with exponential
+# backoff (0.3s, 0.6s, 1.2s) instead of failing the whole fetch. Only idempotent methods are retried.
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class _SessionBackedRequests:
+    """
+    Stand-in for the `requests` module inside an akshare endpoint module.
+    get/post go through a shared Session so connections (and their TLS handshakes) are reused;
+    every other attribute (exceptions, adapters, ...) is forwarded to the real module.
+    """
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def get(self, url, params=None, **kwargs):
+        return self._session.get(url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self._session.post(url, data=data, json=json, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+def create_pooled_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR,
+                  status_forcelist=RETRY_STATUS_CODES, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def install_shared_session(module_names, session: requests.Session = None) -> requests.Session:
+    """
+    Routes the module-level requests.get/post calls of the given modules through one pooled Session.
+    Modules that cannot be imported (e.g. moved in another akshare version) are skipped.
+    :return: The session in use.
+    """
+    if session is None:
+        session = create_pooled_session()
+    shim = _SessionBackedRequests(session)
+    for module_name in module_names:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        if getattr(module, 'requests', None) is requests:
+            module.requests = shim
+    return session
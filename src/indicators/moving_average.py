@@ -1,39 +1,91 @@
 # src/indicators/moving_average.py
-import pandas as pd # pandas can make rolling calculations very easy
-
-def calculate_moving_average(data: list, window: int):
-    if not isinstance(data, list):
-        raise TypeError("Data must be a list.")
-    # This check for data contents being numeric is not in the prompt's example,
-    # but pandas will raise an error if it cannot convert to numeric.
-    # Example: pd.Series([1, 'a', 3]).rolling(window=2).mean() will raise TypeError.
-    # We can rely on pandas for this or add an explicit check.
-    # The prompt's example doesn't have an explicit check for content type.
-
-    if not isinstance(window, int):
-        raise TypeError("Window must be an integer.")
-    if window <= 0:
-        raise ValueError("Window must be a positive integer.")
-
-    if not data or len(data) < window:
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+try:
+    from .utils import batch_result, batch_values, format_indicator_output, validate_indicator_args
+except ImportError:
+    from utils import batch_result, batch_values, format_indicator_output, validate_indicator_args
+
+# Below this length each window is averaged directly (O(N*window), but a single numpy call);
+# from it on, the O(N) cumulative-sum path below is used instead.
+CUMSUM_MIN_LENGTH = 512
+
+def _rolling_mean_cumsum(values: np.ndarray, window: int) -> np.ndarray:
+    # O(N) rolling mean from differences of a running sum, independent of the window size.
+    # Same semantics as rolling(window, min_periods=window).mean(): NaN until the window is full,
+    # and NaN for any window containing a NaN (tracked with a running NaN count).
+    # Works along the last axis, so a 2D array of series (one per row) is handled in one pass.
+    is_nan = np.isnan(values)
+    # Summing deviations from the mean keeps the running sum small, so the differences of two
+    # large partial sums lose less precision on long series. All-NaN series use an offset of 0.
+    valid_counts = (~is_nan).sum(axis=-1, keepdims=True)
+    valid_sums = np.where(is_nan, 0.0, values).sum(axis=-1, keepdims=True)
+    offset = np.divide(valid_sums, valid_counts, out=np.zeros_like(valid_sums), where=valid_counts > 0)
+    pad = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate((pad, np.cumsum(np.where(is_nan, 0.0, values - offset), axis=-1)), axis=-1)
+    nan_counts = np.concatenate((pad, np.cumsum(is_nan, axis=-1)), axis=-1)
+    window_means = (sums[..., window:] - sums[..., :-window]) / window + offset
+    window_means[(nan_counts[..., window:] - nan_counts[..., :-window]) > 0] = np.nan
+    result = np.full(values.shape, np.nan)
+    result[..., window - 1:] = window_means
+    return result
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    # Rolling mean along the last axis, NaN-padded to the input shape. Needs values.shape[-1] >= window.
+    # An inf would spread through the running sum (inf - inf) and turn every later window into NaN,
+    # so inputs holding one take the per-window path, which confines it to the windows containing it.
+    if values.shape[-1] >= CUMSUM_MIN_LENGTH and not np.isinf(values).any():
+        return _rolling_mean_cumsum(values, window)
+    # Read-only (..., len - window + 1, window) view over the values, averaged per window: no copy,
+    # and any NaN in a window makes its mean NaN, as with rolling(min_periods=window).
+    result = np.full(values.shape, np.nan)
+    result[..., window - 1:] = sliding_window_view(values, window, axis=-1).mean(axis=-1)
+    return result
+
+def calculate_moving_average(data, window: int, output: str = 'list'):
+    """
+    Simple moving average over `window` values.
+    :param data: List of prices (None for missing ones) or a numpy array (NaN for missing ones).
+                 float64 arrays are used as-is, without a copy.
+    :param window: Number of values per average.
+    :param output: 'list' (default) for a list of floats/None; 'array' for a float64 numpy array with
+                   NaN where no average is available, skipping the conversion to Python objects
+                   (use it when chaining indicators); 'masked' for an (array, valid mask) tuple.
+    :return: The average values in the requested form, with the same length as data.
+    :raises ValueError: If output is not one of 'list', 'array' or 'masked'.
+    """
+    validate_indicator_args(data, window, 'Window')
+
+    if len(data) == 0 or len(data) < window:
         # Not enough data to calculate MA for any point, or data is empty.
         # Return a list of Nones of the same length as data.
-        return [None] * len(data)
+        return format_indicator_output(np.full(len(data), np.nan), output)
+
+    # One float64 array for the calculation (None becomes NaN); raises ValueError on non-numeric data.
+    values = np.asarray(data, dtype=float)
 
-    # Using pandas for a concise rolling mean calculation
-    # Convert list to a pandas Series
-    s = pd.Series(data, dtype=float) # Using dtype=float for robustness with NaNs
-    
     # Calculate rolling mean.
-    # min_periods=window ensures that you only get a value when you have a full window.
-    # The result will have NaN for initial periods where window is not met.
-    moving_avg = s.rolling(window=window, min_periods=window).mean()
-    
-    # Convert NaN to None for consistency if desired, or keep as float('nan')
-    # Pandas uses float('nan') by default. Let's convert to None as per requirements.
-    moving_avg_list = [val if pd.notna(val) else None for val in moving_avg.tolist()]
-    
-    return moving_avg_list
+    # Only full windows get a value; the result has NaN for the initial periods.
+    moving_avg = _rolling_mean(values, window)
+
+    # numpy uses float('nan') for missing averages; the default 'list' output converts them to None.
+    return format_indicator_output(moving_avg, output)
+
+def calculate_moving_average_batch(data, window: int):
+    """
+    Simple moving average of many series at once, e.g. the closes of several stocks over the same dates.
+    All series are averaged in the same numpy calls instead of one calculate_moving_average call each.
+    :param data: 2D numpy array of shape (n_tickers, n_bars), or a DataFrame with one column per
+                 ticker and one row per bar. Missing prices are NaN.
+    :param window: Number of values per average.
+    :return: Same type and shape as data, with NaN where no average is available.
+    """
+    values = batch_values(data, window, 'Window')
+    if values.shape[-1] < window:
+        moving_avg = np.full(values.shape, np.nan)
+    else:
+        moving_avg = _rolling_mean(values, window)
+    return batch_result(moving_avg, data)
 
 if __name__ == '__main__':
     # Example Usage from the prompt
@@ -89,7 +141,7 @@ if __name__ == '__main__':
         print(f"Error for invalid data type: {e}") # Expected
         
     try:
-        # Example with non-numeric data that pandas will error on
+        # Example with non-numeric data that numpy will error on
         calculate_moving_average([1, 2, 'a', 4, 5], 3)
-    except Exception as e: # Pandas will raise an error converting Series
+    except Exception as e: # numpy will raise an error converting the list
         print(f"Error with non-numeric data in list: {e}")
@@ -1,67 +1,116 @@
 # src/indicators/rsi.py
 import pandas as pd
-import numpy as np # For potential use with np.nan, though pd handles it
+import numpy as np
+try:
+    from .utils import batch_result, batch_values, format_indicator_output, validate_indicator_args
+except ImportError:
+    from utils import batch_result, batch_values, format_indicator_output, validate_indicator_args
+
+def _wilder_smooth(values: np.ndarray, start: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's moving average of per-change values along the last axis, aligned to the price index.
+    Each series starts at its change index `start` (one entry per series): NaN up to `period`
+    prices after it, then the seed (simple mean of the first `period` values from `start`) and its
+    recurrence. The recurrence is an EMA with alpha = 1/period and adjust=False started from the
+    seed, so it runs in pandas' compiled ewm loop rather than in Python. All series are smoothed in
+    a single ewm call (one DataFrame column per series); ewm skips the leading NaNs of each column.
+    """
+    rows = np.atleast_2d(values)
+    start = np.atleast_1d(start)
+    n_changes = rows.shape[-1]
+    seed_pos = start + period - 1
+    seeded = np.where(np.arange(n_changes) > seed_pos[:, None], rows, np.nan)
+    has_seed = seed_pos < n_changes
+    window = np.minimum(start[has_seed, None] + np.arange(period), n_changes - 1)
+    seeded[has_seed, seed_pos[has_seed]] = np.take_along_axis(rows[has_seed], window, axis=-1).mean(axis=-1)
+    smoothed = pd.DataFrame(seeded.T).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy().T
+    padding = np.full(smoothed.shape[:-1] + (1,), np.nan)
+    return np.concatenate((padding, smoothed), axis=-1).reshape(values.shape[:-1] + (n_changes + 1,))
+
+def _rsi(prices: np.ndarray, period: int) -> np.ndarray:
+    # RSI along the last axis of a float array with more than `period` prices per series.
+
+    # Price changes: changes[..., i] is the move into prices[..., i + 1].
+    changes = np.diff(prices, axis=-1)
+
+    # Each series starts at its first valid price (the first change out of it), so leading NaNs,
+    # e.g. a stock listed later than the others in a batch, do not seed the averages with zeros.
+    # Series without any price get a start past the end and stay NaN.
+    has_price = ~np.isnan(prices)
+    start = np.where(has_price.any(axis=-1), has_price.argmax(axis=-1), prices.shape[-1])
+
+    # Separate gains and losses, one ufunc pass each. fmax ignores NaN (unlike maximum), so a
+    # change next to a missing price after the start counts as neither a gain nor a loss.
+    gain = np.fmax(changes, 0.0)
+    loss = np.fmax(-changes, 0.0) # Loss is stored as a positive value
+
+    # Wilder's smoothing: average gain/loss of the first `period` changes, then
+    # avg = (avg_prev * (period - 1) + current) / period for every later change.
+    # The first valid average is at price index `start + period` (0-indexed).
+    avg_gain = _wilder_smooth(gain, start, period)
+    avg_loss = _wilder_smooth(loss, start, period)
 
-def calculate_rsi(data: list, period: int):
-    if not isinstance(data, list):
-        raise TypeError("Data must be a list.")
-    # Consider adding a check for numeric data if not relying solely on pandas
-    # For now, following the prompt's example structure.
-    # Pandas will error on non-numeric data when creating Series with dtype=float.
-
-    if not isinstance(period, int):
-        raise TypeError("Period must be an integer.")
-    if period <= 0:
-        raise ValueError("Period must be a positive integer.")
-
-    # Need at least 'period' changes (deltas), so 'period + 1' data points
-    # for the first RSI value to be calculated at index `period`.
-    # len(data) must be > period. If len(data) == period + 1, we get one RSI value.
-    if not data or len(data) <= period: 
-        return [None] * len(data)
-
-    s = pd.Series(data, dtype=float) # Ensure float for calculations
-
-    # Calculate price differences
-    delta = s.diff() # First element will be NaN
-
-    # Separate gains and losses
-    # .where(condition, other_value) replaces values where condition is False
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0) # Loss is stored as a positive value
-
-    # Calculate initial average gain and loss.
-    # Wilder's smoothing is equivalent to an Exponential Moving Average (EMA) with alpha = 1/period.
-    # In pandas: .ewm(com=period-1, adjust=False).mean()
-    # min_periods=period ensures that we have enough data points to start calculating.
-    # The first valid EWM value will be at index `period` (0-indexed).
-    avg_gain = gain.ewm(com=period - 1, min_periods=period).mean() # adjust=False removed to match prompt
-    avg_loss = loss.ewm(com=period - 1, min_periods=period).mean() # adjust=False removed to match prompt
-    
-    # Calculate RS (Relative Strength)
-    rs = avg_gain / avg_loss
-    
     # Calculate RSI
-    # RSI = 100 - (100 / (1 + RS))
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    
+    # RSI = 100 - (100 / (1 + RS)), with RS = avg_gain / avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
     # Handle specific conditions as per prompt's example structure:
     # If avg_loss is 0, RSI is 100. This handles cases where RS is infinite (avg_gain > 0).
     # If avg_gain is 0, RSI is 0. This handles cases where RS is 0 (avg_loss > 0).
     # This also implies that if both avg_gain and avg_loss are 0, RS is NaN.
     # The condition `rsi[avg_gain == 0] = 0.0` would take precedence if applied last.
     # Let's apply them in the order they appeared in the prompt example:
-    rsi[avg_loss == 0] = 100.0 
+    rsi[avg_loss == 0] = 100.0
     rsi[avg_gain == 0] = 0.0 # This will make RSI 0 if both avg_gain and avg_loss are 0.
 
-    # Convert NaN to None. Initial NaNs come from delta.diff() and ewm min_periods.
-    # delta[0] is NaN.
-    # avg_gain[0]...avg_gain[period-1] are NaN. First valid avg_gain is at index `period`.
-    # Same for avg_loss. So, rs[0]...rs[period-1] are NaN.
-    # Thus, rsi[0]...rsi[period-1] are NaN.
-    rsi_list = [val if pd.notna(val) else None for val in rsi.tolist()]
-    
-    return rsi_list
+    # No RSI for a missing price.
+    rsi[~has_price] = np.nan
+    return rsi
+
+def calculate_rsi(data, period: int, output: str = 'list'):
+    """
+    Relative Strength Index with Wilder's smoothing.
+    :param data: List of prices (None for missing ones) or a numpy array (NaN for missing ones).
+                 float64 arrays are used as-is, without a copy.
+    :param period: Number of price changes per average.
+    :param output: 'list' (default) for a list of floats/None; 'array' for a float64 numpy array with
+                   NaN where no RSI is available, skipping the conversion to Python objects
+                   (use it when chaining indicators); 'masked' for an (array, valid mask) tuple.
+    :return: The RSI values in the requested form, with the same length as data.
+    :raises ValueError: If output is not one of 'list', 'array' or 'masked'.
+    """
+    validate_indicator_args(data, period, 'Period')
+
+    # Need at least 'period' changes (deltas), so 'period + 1' data points
+    # for the first RSI value to be calculated at index `period`.
+    # len(data) must be > period. If len(data) == period + 1, we get one RSI value.
+    if len(data) <= period:
+        return format_indicator_output(np.full(len(data), np.nan), output)
+
+    prices = np.asarray(data, dtype=float) # Ensure float for calculations (None becomes NaN)
+    rsi = _rsi(prices, period)
+
+    # rsi[0]...rsi[period-1] are NaN: there are fewer than `period` changes before them
+    # (Wilder's smoothing only starts there). The default 'list' output converts them to None.
+    return format_indicator_output(rsi, output)
+
+def calculate_rsi_batch(data, period: int):
+    """
+    Relative Strength Index of many series at once, e.g. the closes of several stocks over the same dates.
+    All series are smoothed in the same vectorized calls instead of one calculate_rsi call each.
+    :param data: 2D numpy array of shape (n_tickers, n_bars), or a DataFrame with one column per
+                 ticker and one row per bar. Missing prices are NaN; each series starts at its
+                 first price, so tickers listed later than the others can share the array.
+    :param period: Number of price changes per average.
+    :return: Same type and shape as data, with NaN where no RSI is available (including missing prices).
+    """
+    prices = batch_values(data, period, 'Period')
+    if prices.shape[-1] <= period:
+        rsi = np.full(prices.shape, np.nan)
+    else:
+        rsi = _rsi(prices, period)
+    return batch_result(rsi, data)
 
 if __name__ == '__main__':
     prices = [44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64, 46.21] # Sample prices
@@ -0,0 +1,88 @@
+# src/indicators/utils.py
+import numpy as np
+import pandas as pd
+
+def validate_indicator_args(data, length, length_name: str) -> None:
+    """
+    Shared argument checks for the calculate_* indicator functions.
+    Non-numeric contents are not checked here: np.asarray(data, dtype=float) raises ValueError on them.
+    :param data: Price data; must be a list or a 1-dimensional numpy array (one series).
+    :param length: Window/period argument; must be a positive integer.
+    :param length_name: Name used in error messages, e.g. 'Window' or 'Period'.
+    :raises TypeError: If data or length has the wrong type.
+    :raises ValueError: If data is a numpy array that is not 1-dimensional, or length is not positive.
+    """
+    if not isinstance(data, (list, np.ndarray)):
+        raise TypeError("Data must be a list or a numpy array.")
+    if isinstance(data, np.ndarray) and data.ndim != 1:
+        # Several series at once go through the calculate_*_batch functions.
+        raise ValueError("Data must be 1-dimensional; use the batch function for several series.")
+    if not isinstance(length, int):
+        raise TypeError(f"{length_name} must be an integer.")
+    if length <= 0:
+        raise ValueError(f"{length_name} must be a positive integer.")
+
+def nan_to_none_list(values) -> list:
+    """
+    Converts a float Series/array to a list, with NaN replaced by None.
+    The NaN check is one vectorized np.isnan pass instead of a pd.notna call per element.
+    :param values: pandas Series, numpy array or list of numbers.
+    :return: List of Python floats and None.
+    """
+    arr = np.asarray(values, dtype=float)
+    out = arr.astype(object) # Python floats, so None can be stored in place of NaN
+    out[np.isnan(arr)] = None
+    return out.tolist()
+
+INDICATOR_OUTPUTS = ('list', 'array', 'masked')
+
+def format_indicator_output(values: np.ndarray, output: str):
+    """
+    Shapes the float64 result of a calculate_* indicator function as requested by its caller.
+    :param values: Indicator values, NaN where none is available.
+    :param output: 'list' for a list of floats/None; 'array' for the array itself (no per-element
+                   Python objects, best for chaining indicators); 'masked' for a (values, valid)
+                   tuple where valid is a boolean array that is False where values is NaN.
+    :raises ValueError: If output is not one of INDICATOR_OUTPUTS.
+    """
+    if output == 'list':
+        return nan_to_none_list(values)
+    if output == 'array':
+        return values
+    if output == 'masked':
+        return values, ~np.isnan(values)
+    raise ValueError(f"Output must be one of {', '.join(repr(o) for o in INDICATOR_OUTPUTS)}.")
+
+def batch_values(data, length, length_name: str) -> np.ndarray:
+    """
+    Shared argument checks and conversion for the calculate_*_batch indicator functions.
+    :param data: 2D numpy array of shape (n_tickers, n_bars), or a DataFrame with one column per ticker.
+    :param length: Window/period argument; must be a positive integer.
+    :param length_name: Name used in error messages, e.g. 'Window' or 'Period'.
+    :return: float64 array of shape (n_tickers, n_bars), one series per row.
+    :raises TypeError: If data or length has the wrong type.
+    :raises ValueError: If data is not 2-dimensional or length is not positive.
+    """
+    if not isinstance(data, (pd.DataFrame, np.ndarray)):
+        raise TypeError("Data must be a DataFrame or a numpy array.")
+    if not isinstance(length, int):
+        raise TypeError(f"{length_name} must be an integer.")
+    if length <= 0:
+        raise ValueError(f"{length_name} must be a positive integer.")
+    if isinstance(data, pd.DataFrame):
+        # Columns are tickers: transpose so each series is a row (a view, no copy for float frames).
+        return data.to_numpy(dtype=float).T
+    if data.ndim != 2:
+        raise ValueError("Data must be 2-dimensional: (n_tickers, n_bars).")
+    return np.asarray(data, dtype=float)
+
+def batch_result(values: np.ndarray, data):
+    """
+    Wraps a (n_tickers, n_bars) result of a batch indicator like the input it was computed from.
+    :param values: Result array, one series per row.
+    :param data: The input given to the batch function.
+    :return: A DataFrame with data's index and columns if data is a DataFrame, otherwise values.
+    """
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(values.T, index=data.index, columns=data.columns)
+    return values
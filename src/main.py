@@ -1,43 +1,88 @@
 import argparse
-try:
-    from .data_provider import fetch_stock_data, fetch_stock_basic_info
-    from .analysis_engine import AnalysisEngine
-    from .strategy_configs import STRATEGY_CONFIGS 
-except ImportError: 
-    from data_provider import fetch_stock_data, fetch_stock_basic_info
-    from analysis_engine import AnalysisEngine
-    from strategy_configs import STRATEGY_CONFIGS
-
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def _stock_code(value: str) -> str:
+    # argparse type= converter: rejects malformed codes with a usage error before any fetch.
+    # Uses data_provider's check so there is a single definition of a valid code; it is imported
+    # here rather than at module level so that --help still returns without loading pandas.
+    try:
+        from .data_provider import _is_valid_stock_code
+    except ImportError:
+        from data_provider import _is_valid_stock_code
+    if not _is_valid_stock_code(value):
+        raise argparse.ArgumentTypeError(f"invalid stock code '{value}': expected 6 digits, e.g. '000001'")
+    return value
+
+# Advice shown for each technical outlook returned by AnalysisEngine.generate_signals.
+ACTIONABLE_ADVICE = {
+    'BULLISH': "Consider Buying / Positive Outlook",
+    'BEARISH': "Consider Selling / Negative Outlook",
+    'NEUTRAL_WAIT': "Hold / Wait for Clearer Signals",
+    'MIXED_SIGNALS': "Mixed Signals / Caution Advised",
+    'INSUFFICIENT_DATA': "Unable to provide specific advice due to insufficient data.",
+}
+ERROR_OUTLOOKS = ('CONFIG_ERROR', 'DATA_FORMAT_ERROR', 'INDICATOR_ERROR', 'ERROR', 'NO_DATA')
+
+DISCLAIMER_LINES = (
+    "Disclaimer: This is a software-generated analysis based on technical indicators.",
+    "It is not financial advice. Always do your own research before making any investment decisions.",
+)
+
+def _write_report(lines) -> None:
+    # One write for the whole block instead of one print call (and stdout lock round) per line.
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 def main():
     parser = argparse.ArgumentParser(description="Stock Analysis CLI Tool")
-    parser.add_argument("--stock_code", type=str, required=True, 
+    parser.add_argument("--stock_code", type=_stock_code, required=True, 
                         help="Stock code to analyze (e.g., '000001', '600519').")
     # Step 2, 3, 4, 5: Rename argument, update choices, default, and help string
     parser.add_argument("--timeframe", type=str, choices=['daily', 'weekly', 'monthly'],
                         default='daily',
                         help="Select the analysis timeframe: 'daily' (next-day outlook), 'weekly' (~5 day outlook), or 'monthly' (~20 day outlook). Default is 'daily'.")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Show progress messages from data fetching and analysis.")
     args = parser.parse_args()
 
-    # Fetch stock basic info (name)
-    stock_info = fetch_stock_basic_info(args.stock_code)
-    stock_display_name_formatted = args.stock_code # Default to code
-    if stock_info and stock_info.get('name'):
-        stock_display_name_formatted = f"{stock_info['name']} ({args.stock_code})"
-    
-    print(f"--- Initializing Stock Analysis for: {stock_display_name_formatted} ---")
-    # Step 6: Update variable usage for print
-    print(f"Requested Timeframe: {args.timeframe.capitalize()}")
-
-    print(f"Fetching historical data for {args.stock_code}...")
-    stock_data = fetch_stock_data(args.stock_code)
-
-    if not stock_data:
-        print(f"\nCould not fetch data for {args.stock_code}. Please check the stock code or your network connection.")
-        print("============================================================")
-        print("Disclaimer: This is a software-generated analysis based on technical indicators.")
-        print("It is not financial advice. Always do your own research before making any investment decisions.")
-        print("============================================================")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(levelname)s %(name)s: %(message)s')
+
+    # Imported only once the arguments are valid: these pull in pandas, so --help and errors
+    # in the other arguments return immediately.
+    try:
+        from .data_provider import fetch_stock_data, fetch_stock_basic_info
+        from .analysis_engine import AnalysisEngine
+    except ImportError:
+        from data_provider import fetch_stock_data, fetch_stock_basic_info
+        from analysis_engine import AnalysisEngine
+
+    # The price history does not depend on the basic info, so it is fetched in the background
+    # while the name is looked up: the two requests overlap instead of running back to back.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stock_data_future = executor.submit(fetch_stock_data, args.stock_code)
+
+        # Fetch stock basic info (name)
+        stock_info = fetch_stock_basic_info(args.stock_code)
+        stock_display_name_formatted = args.stock_code # Default to code
+        if stock_info and stock_info.get('name'):
+            stock_display_name_formatted = f"{stock_info['name']} ({args.stock_code})"
+
+        print(f"--- Initializing Stock Analysis for: {stock_display_name_formatted} ---")
+        # Step 6: Update variable usage for print
+        print(f"Requested Timeframe: {args.timeframe.capitalize()}")
+
+        print(f"Fetching historical data for {args.stock_code}...")
+        stock_data = stock_data_future.result()
+
+    if stock_data.empty:
+        report = [f"\nCould not fetch data for {args.stock_code}. Please check the stock code or your network connection.",
+                  "============================================================"]
+        report.extend(DISCLAIMER_LINES)
+        report.append("============================================================")
+        _write_report(report)
         return
 
     engine = AnalysisEngine()
@@ -46,7 +91,7 @@ def main():
 
     # ---- START OF NEW STRUCTURED PRINTING LOGIC ----
 
-    date_of_latest_data = stock_data[-1].get('date', 'N/A') if stock_data else 'N/A'
+    date_of_latest_data = stock_data['date'].iloc[-1] if 'date' in stock_data.columns else 'N/A'
     latest_closing_price = analysis_result.get('latest_close') 
 
     # Step 6: Update variable usage for display variables
@@ -66,56 +111,55 @@ def main():
     explanation_val = analysis_result.get('explanation', 'No explanation provided.')
     indicator_values_dict = analysis_result.get('indicator_values', {})
 
-    actionable_advice_val = "N/A" 
-    if technical_outlook_val == 'BULLISH': actionable_advice_val = "Consider Buying / Positive Outlook"
-    elif technical_outlook_val == 'BEARISH': actionable_advice_val = "Consider Selling / Negative Outlook"
-    elif technical_outlook_val == 'NEUTRAL_WAIT': actionable_advice_val = "Hold / Wait for Clearer Signals"
-    elif technical_outlook_val == 'MIXED_SIGNALS': actionable_advice_val = "Mixed Signals / Caution Advised"
-    elif technical_outlook_val == 'INSUFFICIENT_DATA': actionable_advice_val = "Unable to provide specific advice due to insufficient data."
-    elif technical_outlook_val in ['CONFIG_ERROR', 'DATA_FORMAT_ERROR', 'INDICATOR_ERROR', 'ERROR', 'NO_DATA']:
+    if technical_outlook_val in ACTIONABLE_ADVICE:
+        actionable_advice_val = ACTIONABLE_ADVICE[technical_outlook_val]
+    elif technical_outlook_val in ERROR_OUTLOOKS:
         actionable_advice_val = f"Specific advice cannot be determined due to: {technical_outlook_val}"
-    else: actionable_advice_val = f"Analysis resulted in '{technical_outlook_val}'."
+    else:
+        actionable_advice_val = f"Analysis resulted in '{technical_outlook_val}'."
 
-    print("\n============================================================")
-    print(f"Stock Analysis Report for: {stock_display_name_formatted}")
-    print("============================================================")
+    # The report is collected line by line and written in one go rather than with a print per line.
+    report = []
+    report.append("\n============================================================")
+    report.append(f"Stock Analysis Report for: {stock_display_name_formatted}")
+    report.append("============================================================")
     
-    print(f"Date of Latest Data: {date_of_latest_data}")
+    report.append(f"Date of Latest Data: {date_of_latest_data}")
     if latest_closing_price is not None:
-        print(f"Latest Closing Price: {latest_closing_price:.2f}")
+        report.append(f"Latest Closing Price: {latest_closing_price:.2f}")
     else:
         if technical_outlook_val not in ['DATA_FORMAT_ERROR', 'NO_DATA']:
-            print(f"Latest Closing Price: N/A")
+            report.append("Latest Closing Price: N/A")
 
-    print("------------------------------------------------------------")
-    print("Analysis Parameters:")
-    print("------------------------------------------------------------")
+    report.append("------------------------------------------------------------")
+    report.append("Analysis Parameters:")
+    report.append("------------------------------------------------------------")
     # Step 6: Update variable usage for print
-    print(f"Timeframe Selected: {timeframe_selected_display}")
-    print(f"Strategy Used: {strategy_description}")
+    report.append(f"Timeframe Selected: {timeframe_selected_display}")
+    report.append(f"Strategy Used: {strategy_description}")
     if technical_outlook_val not in ['CONFIG_ERROR']:
-        print(f"Indicator Config: {indicator_config_display}")
+        report.append(f"Indicator Config: {indicator_config_display}")
 
-    print("------------------------------------------------------------")
-    print("Analysis Results:")
-    print("------------------------------------------------------------")
-    print(f"Technical Outlook: {technical_outlook_val}")
-    print(f"Actionable Advice: {actionable_advice_val}") 
+    report.append("------------------------------------------------------------")
+    report.append("Analysis Results:")
+    report.append("------------------------------------------------------------")
+    report.append(f"Technical Outlook: {technical_outlook_val}")
+    report.append(f"Actionable Advice: {actionable_advice_val}") 
     
-    print("\nExplanation:") 
-    print(f"  {explanation_val}") 
+    report.append("\nExplanation:") 
+    report.append(f"  {explanation_val}") 
 
     if indicator_values_dict and technical_outlook_val not in ['CONFIG_ERROR', 'DATA_FORMAT_ERROR', 'NO_DATA', 'ERROR']:
-        print("\nIndicator Values:") 
+        report.append("\nIndicator Values:") 
         for key, value in indicator_values_dict.items():
-            print(f"  - {key}: {value}")
+            report.append(f"  - {key}: {value}")
     elif technical_outlook_val not in ['CONFIG_ERROR', 'DATA_FORMAT_ERROR', 'NO_DATA', 'ERROR', 'INSUFFICIENT_DATA']:
-        print("\nIndicator Values: Not available for this outlook.")
+        report.append("\nIndicator Values: Not available for this outlook.")
 
-    print("------------------------------------------------------------")
-    print("Disclaimer: This is a software-generated analysis based on technical indicators.")
-    print("It is not financial advice. Always do your own research before making any investment decisions.")
-    print("============================================================")
+    report.append("------------------------------------------------------------")
+    report.extend(DISCLAIMER_LINES)
+    report.append("============================================================")
+    _write_report(report)
 
 if __name__ == "__main__":
     main()
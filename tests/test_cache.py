@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import unittest.mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.cache import FileCache
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(self.tmp_dir.name)
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def loader(self):
+        self.calls += 1
+        return {'value': self.calls}
+
+    def test_miss_then_hit(self):
+        first = self.cache.get_or_set('fn', '000001', {'a': 1}, self.loader, ttl_days=1)
+        second = self.cache.get_or_set('fn', '000001', {'a': 1}, self.loader, ttl_days=1)
+        self.assertEqual(first, {'value': 1})
+        self.assertEqual(second, {'value': 1})
+        self.assertEqual(self.calls, 1)
+
+    def test_params_are_part_of_key(self):
+        self.cache.get_or_set('fn', '000001', {'a': 1}, self.loader)
+        self.cache.get_or_set('fn', '000001', {'a': 2}, self.loader)
+        self.cache.get_or_set('fn', '600519', {'a': 1}, self.loader)
+        self.assertEqual(self.calls, 3)
+
+    def test_expired_entry_is_reloaded(self):
+        self.cache.get_or_set('fn', '000001', {}, self.loader, ttl_days=1)
+        _, meta_path = self.cache._paths('fn', '000001', {})
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': 0}, f) # Pretend the entry was fetched in 1970
+        self.assertEqual(self.cache.get_or_set('fn', '000001', {}, self.loader, ttl_days=1), {'value': 2})
+        self.assertEqual(self.calls, 2)
+
+    def test_no_ttl_never_expires(self):
+        self.cache.get_or_set('fn', '000001', {}, self.loader)
+        _, meta_path = self.cache._paths('fn', '000001', {})
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': 0}, f)
+        self.assertEqual(self.cache.get_or_set('fn', '000001', {}, self.loader, ttl_days=None), {'value': 1})
+        self.assertEqual(self.calls, 1)
+
+    def test_none_is_not_cached(self):
+        self.cache.get_or_set('fn', '000001', {}, lambda: None)
+        self.assertIsNone(self.cache.get('fn', '000001', {}))
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.cache.get_or_set('fn', '000001', {}, self.loader)
+        data_path, _ = self.cache._paths('fn', '000001', {})
+        with open(data_path, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(self.cache.get('fn', '000001', {}))
+
+    def test_repeat_hit_is_served_from_memory(self):
+        self.cache.get_or_set('fn', '000001', {}, self.loader)
+        with unittest.mock.patch('src.cache.pickle.load', side_effect=AssertionError("unpickled again")):
+            self.assertEqual(self.cache.get('fn', '000001', {}), {'value': 1})
+
+    def test_memory_copy_is_dropped_when_file_is_rewritten(self):
+        self.cache.get_or_set('fn', '000001', {}, self.loader)
+        # Another process (here: another instance) refreshes the entry on disk.
+        FileCache(self.tmp_dir.name).set('fn', '000001', {}, {'value': 'fresh'})
+        self.assertEqual(self.cache.get('fn', '000001', {}), {'value': 'fresh'})
+
+    def test_memory_is_bounded(self):
+        cache = FileCache(self.tmp_dir.name, memory_size=2)
+        for symbol in ['000001', '000002', '000003']:
+            cache.set('fn', symbol, {}, symbol)
+        self.assertEqual(list(cache._memory), [cache._paths('fn', s, {})[0] for s in ['000002', '000003']])
+        self.assertEqual(cache.get('fn', '000001', {}), '000001') # Evicted entries are still on disk
+
+if __name__ == '__main__':
+    unittest.main()
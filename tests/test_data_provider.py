@@ -0,0 +1,227 @@
+import unittest
+import unittest.mock
+import contextlib
+import sys
+import os
+import tempfile
+from datetime import date, datetime
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import data_provider
+from src.cache import FileCache
+from src.data_provider import fetch_stock_data, fetch_stock_basic_info, fetch_all_stock_basic_info, fetch_many_stock_data, STOCK_DATA_COLUMNS
+
+def fake_stock_zh_a_hist(symbol, period, start_date, end_date, adjust):
+    # Same column layout as akshare.stock_zh_a_hist; '000000' has no data. Prices follow the date
+    # (10.0 on 2024-01-01), so overlapping fetches agree on the bars they share.
+    days = [] if symbol == '000000' else pd.bdate_range(start_date, end_date)
+    prices = [float((d - pd.Timestamp('2024-01-01')).days + 10) for d in days]
+    return pd.DataFrame({
+        '日期': [d.date() for d in days], '股票代码': symbol,
+        '开盘': prices, '收盘': prices, '最高': prices, '最低': prices, '成交量': 1000,
+        '成交额': 1.0, '振幅': 1.0, '涨跌幅': 1.0, '涨跌额': 1.0, '换手率': 1.0,
+    })
+
+class TestStockCodeValidation(unittest.TestCase):
+    def setUp(self):
+        # Any attempt to reach akshare fails the test: invalid codes must be rejected before it.
+        self._original_get_akshare = data_provider._get_akshare
+        data_provider._get_akshare = lambda: self.fail("akshare should not be called for an invalid code")
+
+    def tearDown(self):
+        data_provider._get_akshare = self._original_get_akshare
+
+    def test_valid_codes(self):
+        for code in ['000001', '300750', '600519', '830799', '920002']:
+            self.assertTrue(data_provider._is_valid_stock_code(code), code)
+
+    def test_invalid_codes(self):
+        for code in ['INVALIDCODE', '00001', '0000011', 'sh600519', '', None, 600519,
+                     '６００５１９', '٦٠٠٥١٩']: # Full-width and Arabic-Indic digits
+            self.assertFalse(data_provider._is_valid_stock_code(code), code)
+
+    def test_fetch_stock_data_invalid_code(self):
+        df = fetch_stock_data('INVALIDCODE', start_date='20240101', end_date='20240110')
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), STOCK_DATA_COLUMNS)
+        self.assertEqual(fetch_stock_data('INVALIDCODE', as_records=True), [])
+
+    def test_fetch_stock_basic_info_invalid_code(self):
+        self.assertEqual(fetch_stock_basic_info('INVALIDCODE'), {})
+
+class TestFetchStockData(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self._original_cache = data_provider._cache
+        self._original_call_akshare = data_provider._call_akshare
+        data_provider._cache = FileCache(self.tmp_dir.name)
+        data_provider._call_akshare = lambda func_name, **kwargs: fake_stock_zh_a_hist(**kwargs)
+
+    def tearDown(self):
+        data_provider._cache = self._original_cache
+        data_provider._call_akshare = self._original_call_akshare
+        self.tmp_dir.cleanup()
+
+    def test_fetch_stock_data(self):
+        df = fetch_stock_data('000001', start_date='20240101', end_date='20240105')
+        self.assertEqual(list(df.columns), STOCK_DATA_COLUMNS)
+        self.assertEqual(df['date'].tolist(), ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'])
+        self.assertEqual(fetch_stock_data('000001', start_date='20240101', end_date='20240102', as_records=True),
+                         [{'date': '2024-01-01', 'open': 10.0, 'high': 10.0, 'low': 10.0, 'close': 10.0, 'volume': 1000},
+                          {'date': '2024-01-02', 'open': 11.0, 'high': 11.0, 'low': 11.0, 'close': 11.0, 'volume': 1000}])
+
+    def test_fetch_many_stock_data(self):
+        df = fetch_many_stock_data(['000001', '000000', '600519'], start_date='20240101', end_date='20240103')
+        self.assertEqual(list(df.columns), STOCK_DATA_COLUMNS)
+        self.assertEqual(df.index.get_level_values('code').unique().tolist(), ['000001', '600519'])
+        self.assertEqual(len(df.loc['600519']), 3)
+        self.assertEqual(df['close'].dtype, float)
+
+    def test_fetch_many_stock_data_without_data(self):
+        df = fetch_many_stock_data(['000000', 'INVALIDCODE'])
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), STOCK_DATA_COLUMNS)
+
+def fake_basic_info_akshare(func_name, symbol=None):
+    # Stub for stock_zh_a_spot_em (the market-wide snapshot, without the newly listed 920002)
+    # and stock_individual_info_em (per-symbol item/value rows).
+    names = {'000001': '平安银行', '600519': '贵州茅台', '920002': '新股'}
+    if func_name == 'stock_zh_a_spot_em':
+        return pd.DataFrame({'代码': ['000001', '600519'], '名称': ['平安银行', '贵州茅台'], '总市值': 1.0})
+    return pd.DataFrame({'item': ['股票代码', '股票简称', '行业'], 'value': [symbol, names.get(symbol), '银行']})
+
+class TestFetchStockBasicInfo(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self._original_cache = data_provider._cache
+        self._original_call_akshare = data_provider._call_akshare
+        data_provider._cache = FileCache(self.tmp_dir.name)
+        self.calls = []
+        def call_akshare(func_name, **kwargs):
+            self.calls.append(func_name)
+            return fake_basic_info_akshare(func_name, **kwargs)
+        data_provider._call_akshare = call_akshare
+        data_provider._load_all_stock_names.cache_clear()
+
+    def tearDown(self):
+        data_provider._cache = self._original_cache
+        data_provider._call_akshare = self._original_call_akshare
+        data_provider._load_all_stock_names.cache_clear()
+        self.tmp_dir.cleanup()
+
+    def test_both_paths_return_same_keys(self):
+        fetch_all_stock_basic_info() # A loaded snapshot does not change the default per-symbol path
+        self.assertEqual(fetch_stock_basic_info('000001'), {'name': '平安银行'})
+        self.assertEqual(self.calls, ['stock_zh_a_spot_em', 'stock_individual_info_em'])
+        self.assertEqual(fetch_stock_basic_info('600519', use_snapshot=True), {'name': '贵州茅台'})
+        self.assertEqual(self.calls.count('stock_individual_info_em'), 1)
+
+    def test_code_missing_from_snapshot_is_looked_up_individually(self):
+        self.assertEqual(fetch_stock_basic_info('920002', use_snapshot=True), {'name': '新股'})
+        self.assertEqual(self.calls, ['stock_zh_a_spot_em', 'stock_individual_info_em'])
+
+    def test_fetch_all_returns_a_copy(self):
+        all_info = fetch_all_stock_basic_info()
+        self.assertEqual(all_info['000001'], {'name': '平安银行'})
+        all_info['000001']['name'] = 'changed'
+        del all_info['600519']
+        self.assertEqual(fetch_all_stock_basic_info()['000001'], {'name': '平安银行'})
+        self.assertEqual(fetch_stock_basic_info('600519', use_snapshot=True), {'name': '贵州茅台'})
+
+class TestPriceHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self._original_cache = data_provider._cache
+        self._original_call_akshare = data_provider._call_akshare
+        data_provider._cache = FileCache(self.tmp_dir.name)
+        data_provider._call_akshare = self._fake_call_akshare
+        self.calls = []
+        self.adjustment = 0.0 # Added to every close, e.g. after a dividend re-adjusted qfq prices
+        self.empty_windows = set() # (start_date, end_date) requests answered with no rows
+
+    def tearDown(self):
+        data_provider._cache = self._original_cache
+        data_provider._call_akshare = self._original_call_akshare
+        self.tmp_dir.cleanup()
+
+    def _fake_call_akshare(self, func_name, **kwargs):
+        window = (kwargs['start_date'], kwargs['end_date'])
+        self.calls.append(window)
+        if window in self.empty_windows:
+            kwargs['symbol'] = '000000'
+        df = fake_stock_zh_a_hist(**kwargs)
+        df['收盘'] += self.adjustment
+        return df
+
+    @contextlib.contextmanager
+    def _at(self, moment: datetime):
+        # Runs the store logic as if the local time were `moment`.
+        class FakeDate(date):
+            @classmethod
+            def today(cls):
+                return moment.date()
+        with unittest.mock.patch.object(data_provider, 'date', FakeDate), \
+                unittest.mock.patch.object(data_provider.time, 'time', return_value=moment.timestamp()):
+            yield
+
+    def _closes(self, start_date, end_date):
+        df = fetch_stock_data('000001', start_date=start_date, end_date=end_date)
+        return dict(zip(df['date'], df['close']))
+
+    def test_incremental_fetch_starts_at_second_to_last_bar(self):
+        with self._at(datetime(2024, 1, 5, 11)):
+            self._closes('20240101', '20240105')
+        with self._at(datetime(2024, 1, 8, 16)):
+            closes = self._closes('20240101', '20240108')
+        self.assertEqual(self.calls, [('20240101', '20240105'), ('20240104', '20240108')])
+        self.assertEqual(list(closes), ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05', '2024-01-08'])
+        self.assertEqual(closes['2024-01-08'], 17.0)
+
+    def test_readjusted_overlap_refetches_whole_store(self):
+        with self._at(datetime(2024, 1, 5, 16)):
+            self._closes('20240101', '20240105')
+        self.adjustment = 1.0
+        with self._at(datetime(2024, 1, 8, 16)):
+            closes = self._closes('20240101', '20240108')
+        self.assertEqual(self.calls[1:], [('20240104', '20240108'), ('20240101', '20240108')])
+        self.assertEqual(closes['2024-01-01'], 11.0)
+        self.assertEqual(len(closes), 6)
+
+    def test_empty_readjusted_refetch_serves_stored_bars(self):
+        with self._at(datetime(2024, 1, 5, 16)):
+            self._closes('20240101', '20240105')
+        self.adjustment = 1.0
+        self.empty_windows.add(('20240101', '20240108'))
+        with self._at(datetime(2024, 1, 8, 16)):
+            closes = self._closes('20240101', '20240108')
+        self.assertEqual(closes, {'2024-01-01': 10.0, '2024-01-02': 11.0, '2024-01-03': 12.0, '2024-01-04': 13.0, '2024-01-05': 14.0})
+
+    def test_empty_incremental_fetch_serves_stored_bars(self):
+        with self._at(datetime(2024, 1, 5, 16)):
+            self._closes('20240101', '20240105')
+        self.empty_windows.add(('20240104', '20240108'))
+        with self._at(datetime(2024, 1, 8, 16)):
+            closes = self._closes('20240101', '20240108')
+        self.assertEqual(self.calls[1:], [('20240104', '20240108')])
+        self.assertEqual(list(closes), ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'])
+
+    def test_window_inside_store_makes_no_call(self):
+        with self._at(datetime(2024, 1, 10, 16)):
+            self._closes('20240101', '20240110')
+            closes = self._closes('20240102', '20240104')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(list(closes), ['2024-01-02', '2024-01-03', '2024-01-04'])
+
+    def test_bar_fetched_on_its_own_day_is_refreshed_later(self):
+        # Fetched mid-session on 2024-01-05: that day's bar may be partial, the ones before are final.
+        with self._at(datetime(2024, 1, 5, 11)):
+            self._closes('20240101', '20240105')
+        with self._at(datetime(2024, 1, 8, 9)):
+            self._closes('20240101', '20240104')
+            self.assertEqual(len(self.calls), 1)
+            self._closes('20240101', '20240105')
+        self.assertEqual(self.calls[1:], [('20240104', '20240105')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import types
+import unittest.mock
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import http_session
+from src.http_session import install_shared_session
+
+FAKE_MODULE_NAME = 'fake_akshare_endpoint'
+
+class TestInstallSharedSession(unittest.TestCase):
+    def setUp(self):
+        # Stand-in for an akshare endpoint module that calls requests.get/post directly.
+        self.module = types.ModuleType(FAKE_MODULE_NAME)
+        self.module.requests = requests
+        sys.modules[FAKE_MODULE_NAME] = self.module
+        self.session = install_shared_session([FAKE_MODULE_NAME, 'module_that_does_not_exist'])
+
+    def tearDown(self):
+        del sys.modules[FAKE_MODULE_NAME]
+        self.session.close()
+
+    def test_get_and_post_use_shared_session(self):
+        with unittest.mock.patch.object(self.session, 'request', return_value='response') as request:
+            self.assertEqual(self.module.requests.get('https://example.com/a', params={'x': 1}, timeout=5), 'response')
+            self.assertEqual(self.module.requests.post('https://example.com/b', json={'y': 2}), 'response')
+        self.assertEqual(request.call_args_list[0].args, ('GET', 'https://example.com/a'))
+        self.assertEqual(request.call_args_list[0].kwargs['params'], {'x': 1})
+        self.assertEqual(request.call_args_list[0].kwargs['timeout'], 5)
+        self.assertEqual(request.call_args_list[1].args, ('POST', 'https://example.com/b'))
+        self.assertEqual(request.call_args_list[1].kwargs['json'], {'y': 2})
+
+    def test_pool_size_on_both_schemes(self):
+        for url in ('http://example.com', 'https://example.com'):
+            adapter = self.session.get_adapter(url)
+            self.assertEqual(adapter._pool_connections, http_session.POOL_SIZE)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], http_session.POOL_SIZE)
+
+    def test_retry_policy_on_both_schemes(self):
+        for url in ('http://example.com', 'https://example.com'):
+            retry = self.session.get_adapter(url).max_retries
+            self.assertEqual(retry.total, http_session.RETRY_TOTAL)
+            self.assertEqual(retry.backoff_factor, http_session.RETRY_BACKOFF_FACTOR)
+            self.assertEqual(set(retry.status_forcelist), set(http_session.RETRY_STATUS_CODES))
+            self.assertFalse(retry.raise_on_status) # The last 429/5xx answer is returned, not raised
+
+    def test_other_attributes_fall_through_to_requests(self):
+        self.assertIsNot(self.module.requests, requests)
+        self.assertIs(self.module.requests.exceptions, requests.exceptions)
+        self.assertIs(self.module.requests.Session, requests.Session)
+        with self.assertRaises(AttributeError):
+            self.module.requests.no_such_attribute
+
+if __name__ == '__main__':
+    unittest.main()
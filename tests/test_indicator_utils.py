@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.indicators.utils import format_indicator_output, nan_to_none_list
+
+class TestNanToNoneList(unittest.TestCase):
+    def test_series(self):
+        result = nan_to_none_list(pd.Series([np.nan, 1.5, np.nan, 2.0]))
+        self.assertEqual(result, [None, 1.5, None, 2.0])
+        self.assertIs(type(result[1]), float) # Python floats, not numpy scalars
+
+    def test_array_and_list(self):
+        self.assertEqual(nan_to_none_list(np.array([1.0, np.nan])), [1.0, None])
+        self.assertEqual(nan_to_none_list([1, None, 3]), [1.0, None, 3.0])
+
+    def test_empty(self):
+        self.assertEqual(nan_to_none_list([]), [])
+
+class TestFormatIndicatorOutput(unittest.TestCase):
+    def test_outputs(self):
+        values = np.array([np.nan, 1.5, 2.0])
+        self.assertEqual(format_indicator_output(values, 'list'), [None, 1.5, 2.0])
+        self.assertIs(format_indicator_output(values, 'array'), values)
+        masked_values, valid = format_indicator_output(values, 'masked')
+        self.assertIs(masked_values, values)
+        np.testing.assert_array_equal(valid, [False, True, True])
+
+    def test_invalid_output(self):
+        with self.assertRaises(ValueError):
+            format_indicator_output(np.array([1.0]), 'tuple')
+
+if __name__ == '__main__':
+    unittest.main()
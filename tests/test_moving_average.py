@@ -1,10 +1,12 @@
 import unittest
 import sys
 import os
+import numpy as np
+import pandas as pd
 
 # Adjust path to import from src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.indicators.moving_average import calculate_moving_average
+from src.indicators.moving_average import calculate_moving_average, calculate_moving_average_batch, CUMSUM_MIN_LENGTH
 
 class TestMovingAverage(unittest.TestCase):
     def test_standard_ma(self):
@@ -47,5 +49,69 @@ class TestMovingAverage(unittest.TestCase):
         with self.assertRaises(TypeError):
             calculate_moving_average([10, 11, 12], "not an int")
 
+    def test_long_series_matches_rolling_mean(self): # Long inputs take the cumulative-sum path
+        prices = [100 + (i * 37 % 101) / 10 for i in range(CUMSUM_MIN_LENGTH + 100)]
+        prices[50] = None
+        result = calculate_moving_average(prices, 20)
+        for i, value in enumerate(result):
+            if i < 19 or 50 <= i < 70: # Window not full yet, or contains the missing price
+                self.assertIsNone(value)
+            else:
+                self.assertAlmostEqual(value, sum(prices[i - 19:i + 1]) / 20, places=9)
+
+    def test_long_series_with_inf(self): # Only the windows containing the inf are affected
+        prices = np.array([100 + (i * 37 % 101) / 10 for i in range(CUMSUM_MIN_LENGTH + 100)])
+        prices[50] = np.inf
+        result = calculate_moving_average(prices, 20, output='array')
+        expected = pd.Series(prices).rolling(20).mean().to_numpy()
+        self.assertTrue(np.isinf(result[50:70]).all())
+        self.assertTrue(np.isfinite(result[70:]).all())
+        np.testing.assert_allclose(result[70:], expected[70:])
+        np.testing.assert_allclose(result[19:50], expected[19:50])
+
+    def test_numpy_input_and_array_output(self):
+        prices = np.array([10, 11, 12, 13, 14], dtype=float)
+        self.assertEqual(calculate_moving_average(prices, 3), [None, None, 11.0, 12.0, 13.0])
+        result = calculate_moving_average(prices, 3, output='array')
+        self.assertIsInstance(result, np.ndarray)
+        np.testing.assert_array_equal(result, [np.nan, np.nan, 11.0, 12.0, 13.0])
+        np.testing.assert_array_equal(calculate_moving_average(prices, 10, output='array'), [np.nan] * 5)
+        values, valid = calculate_moving_average(prices, 3, output='masked')
+        np.testing.assert_array_equal(values[valid], [11.0, 12.0, 13.0])
+        np.testing.assert_array_equal(valid, [False, False, True, True, True])
+        with self.assertRaises(ValueError):
+            calculate_moving_average(prices, 3, output='dict')
+
+    def test_2d_array_rejected(self): # Several series go through the batch function
+        with self.assertRaises(ValueError):
+            calculate_moving_average(np.ones((2, 5)), 2)
+
+    def test_batch_matches_single_series(self):
+        for n_bars in (30, CUMSUM_MIN_LENGTH + 10): # Both the sliding-window and the cumulative-sum path
+            rows = np.array([[100 + (i * k % 53) / 10 for i in range(n_bars)] for k in (7, 11, 13)])
+            rows[1, 5] = np.nan
+            result = calculate_moving_average_batch(rows, 5)
+            self.assertEqual(result.shape, rows.shape)
+            for row, row_result in zip(rows, result):
+                np.testing.assert_allclose(row_result, calculate_moving_average(row, 5, output='array'))
+
+    def test_batch_dataframe_columns_are_tickers(self):
+        frame = pd.DataFrame({'000001': [10.0, 11.0, 12.0, 13.0], '600519': [20.0, 22.0, 24.0, 26.0]},
+                             index=pd.date_range('2024-01-01', periods=4))
+        result = calculate_moving_average_batch(frame, 2)
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(list(result.columns), ['000001', '600519'])
+        self.assertTrue(result.index.equals(frame.index))
+        np.testing.assert_array_equal(result['600519'], [np.nan, 21.0, 23.0, 25.0])
+        self.assertTrue(calculate_moving_average_batch(frame, 10).isna().all().all()) # Window longer than the data
+
+    def test_batch_invalid_input(self):
+        with self.assertRaises(TypeError):
+            calculate_moving_average_batch([[1.0, 2.0]], 2)
+        with self.assertRaises(ValueError):
+            calculate_moving_average_batch(np.array([1.0, 2.0]), 2)
+        with self.assertRaises(ValueError):
+            calculate_moving_average_batch(np.ones((2, 3)), 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,9 +2,11 @@ import unittest
 import sys
 import os
 import math # For isnan checks if comparing floats
+import numpy as np
+import pandas as pd
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.indicators.rsi import calculate_rsi
+from src.indicators.rsi import calculate_rsi, calculate_rsi_batch
 
 class TestRSI(unittest.TestCase):
     def test_standard_rsi(self):
@@ -98,5 +100,65 @@ class TestRSI(unittest.TestCase):
             self.assertAlmostEqual(rsi_values[i], 0, places=4)
 
 
+    def test_rsi_wilder_reference_values(self):
+        # Wilder's textbook RSI(14) example: first value is seeded with simple averages of 14 changes
+        prices = [44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89, 46.03, 45.61, 46.28,
+                  46.28, 46.00, 46.03, 46.41, 46.22, 45.64, 46.21]
+        rsi_values = calculate_rsi(prices, 14)
+        self.assertAlmostEqual(rsi_values[14], 70.4641, places=4)
+        self.assertAlmostEqual(rsi_values[15], 66.2496, places=4)
+        self.assertAlmostEqual(rsi_values[20], 62.8807, places=4)
+
+    def test_rsi_numpy_input_and_array_output(self):
+        prices = [10, 11, 10, 11, 10, 11, 10, 11]
+        expected = calculate_rsi(prices, 3)
+        result = calculate_rsi(np.array(prices, dtype=float), 3, output='array')
+        self.assertIsInstance(result, np.ndarray)
+        self.assertTrue(np.isnan(result[:3]).all())
+        np.testing.assert_allclose(result[3:], expected[3:])
+        short_result = calculate_rsi(np.array([1.0, 2.0]), 3, output='array') # Fewer prices than period + 1
+        self.assertEqual(len(short_result), 2)
+        self.assertTrue(np.isnan(short_result).all())
+
+    def test_rsi_missing_price_counts_as_no_change(self):
+        prices = [10.0, 11.0, None, 12.0, 11.0, 12.0]
+        # Both changes next to the missing price count as 0: gains 1, 0, 0, 0, 1 and losses 0, 0, 0, 1, 0.
+        result = calculate_rsi(prices, 3)
+        self.assertEqual(result[:3], [None, None, None])
+        self.assertAlmostEqual(result[3], 100.0)
+        self.assertAlmostEqual(result[4], 100.0 - 100.0 / (1.0 + (2.0 / 9) / (1.0 / 3)))
+        self.assertTrue(all(value is not None for value in result[3:]))
+
+    def test_rsi_2d_array_rejected(self): # Several series go through the batch function
+        with self.assertRaises(ValueError):
+            calculate_rsi(np.ones((2, 5)), 2)
+
+    def test_rsi_batch_matches_single_series(self):
+        rows = np.array([[44 + (i * k % 17) / 4 for i in range(40)] for k in (3, 5, 7)])
+        rows[2, 10] = np.nan
+        result = calculate_rsi_batch(rows, 14)
+        self.assertEqual(result.shape, rows.shape)
+        for row, row_result in zip(rows, result):
+            np.testing.assert_allclose(row_result, calculate_rsi(row, 14, output='array'))
+
+    def test_rsi_batch_missing_prices(self):
+        rows = np.array([[np.nan] * 20, [np.nan] * 10 + [float(40 + i) for i in range(10)]])
+        result = calculate_rsi_batch(rows, 5)
+        self.assertTrue(np.isnan(result[0]).all()) # No prices at all
+        # A series listed later starts at its first price: 5 changes later the seed is all gains.
+        self.assertTrue(np.isnan(result[1, :15]).all())
+        np.testing.assert_array_equal(result[1, 15:], 100.0)
+        np.testing.assert_array_equal(result[1, 10:], calculate_rsi(rows[1, 10:], 5, output='array'))
+
+    def test_rsi_batch_dataframe(self):
+        frame = pd.DataFrame({'up': [float(40 + i) for i in range(20)], 'down': [float(60 - i) for i in range(20)]})
+        result = calculate_rsi_batch(frame, 14)
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(list(result.columns), ['up', 'down'])
+        self.assertTrue(result.iloc[:14].isna().all().all())
+        self.assertTrue((result['up'].iloc[14:] == 100.0).all())
+        self.assertTrue((result['down'].iloc[14:] == 0.0).all())
+        self.assertTrue(calculate_rsi_batch(frame.iloc[:5], 14).isna().all().all()) # Fewer prices than period + 1
+
 if __name__ == '__main__':
     unittest.main()